@@ -1,14 +1,18 @@
+import os
+import argparse
 import pygame
 import sys
 import time
 import threading
 import random
 import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Optional
 
 
 class KnightTourGame:
-    def __init__(self, board_size: int = 8):
+    def __init__(self, board_size: int = 8, headless: bool = False):
         self.board_size = board_size
         self.board = [[0 for _ in range(board_size)] for _ in range(board_size)]
         self.visited = [[False for _ in range(board_size)] for _ in range(board_size)]
@@ -22,6 +26,14 @@ class KnightTourGame:
         self.auto_playing = False
         self.auto_thread = None
 
+        # Undo/redo history: every square visited in order (entries past move_count can be redone),
+        # plus board snapshots every checkpoint_interval moves for fast timeline jumps. With one
+        # snapshot per board row, a jump replays fewer moves than a row has squares.
+        self.move_history = []
+        self.checkpoints = {}
+        self.checkpoint_interval = board_size
+        self.dragging_timeline = False
+
         # Knight's 8 possible move directions
         self.knight_moves = [
             (-2, -1), (-2, 1), (-1, -2), (-1, 2),
@@ -32,13 +44,16 @@ class KnightTourGame:
         self.files = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
         self.ranks = ['1', '2', '3', '4', '5', '6', '7', '8']
 
-        # Pygame initialization
+        # Pygame initialization (headless mode renders offscreen under the SDL dummy driver)
+        self.headless = headless
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
         pygame.init()
         self.cell_size = 91
         self.label_size = 39
         self.board_width = self.board_size * self.cell_size
         self.board_height = self.board_size * self.cell_size
-        self.info_height = 250
+        self.info_height = 320
 
         # Uniform margins around everything
         self.margin = 20
@@ -46,8 +61,17 @@ class KnightTourGame:
         # Calculate screen size with uniform margins
         self.screen_width = self.board_width + self.label_size * 2 + self.margin * 2
         self.screen_height = self.board_height + self.label_size + self.info_height + self.margin * 2
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("Knight's Tour Game")
+        # Exported images end where the button rows start
+        self.export_height = self.board_height + self.label_size + self.margin + 169
+        if headless:
+            self.screen_height = self.export_height
+            self.screen = pygame.Surface((self.screen_width, self.screen_height))
+        else:
+            self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+            pygame.display.set_caption("Knight's Tour Game")
+
+        # Reusable semi-transparent layer for the move arrow
+        self.arrow_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
 
         # Board offset for labels and margins
         self.board_offset_x = self.label_size + self.margin
@@ -129,6 +153,24 @@ class KnightTourGame:
                 'text': 'Exit Game',
                 'color': self.LIGHT_BLUE,
                 'hover_color': self.DARKER_BLUE
+            },
+            'undo': {
+                'rect': pygame.Rect(self.margin, 0, 2 * self.button_width + self.button_spacing,
+                                    self.button_height),
+                'text': 'Undo',
+                'color': self.LIGHT_BLUE,
+                'hover_color': self.DARKER_BLUE,
+                'disabled_color': self.DISABLED_GRAY,
+                'row': 1
+            },
+            'redo': {
+                'rect': pygame.Rect(self.margin + 2 * (self.button_width + self.button_spacing), 0,
+                                    2 * self.button_width + self.button_spacing, self.button_height),
+                'text': 'Redo',
+                'color': self.LIGHT_BLUE,
+                'hover_color': self.DARKER_BLUE,
+                'disabled_color': self.DISABLED_GRAY,
+                'row': 1
             }
         }
 
@@ -143,6 +185,8 @@ class KnightTourGame:
         self.visited[start_y][start_x] = True
         self.board[start_y][start_x] = 1
         self.move_count = 1
+        self.move_history = [(start_x, start_y)]
+        self.checkpoints = {}
 
     def board_to_chess_notation(self, x: int, y: int) -> str:
         """Convert board coordinates to chess notation"""
@@ -264,25 +308,106 @@ class KnightTourGame:
         possible_moves = self.get_possible_moves(current_x, current_y)
 
         if (x, y) in possible_moves:
-            # Record previous position for arrow display
-            self.previous_pos = self.knight_pos
+            # Keep the redo history if this is the move that was undone, otherwise discard it
+            if self.move_count < len(self.move_history) and self.move_history[self.move_count] != (x, y):
+                del self.move_history[self.move_count:]
+                self.checkpoints = {k: v for k, v in self.checkpoints.items() if k <= self.move_count}
+            if self.move_count == len(self.move_history):
+                self.move_history.append((x, y))
+
+            self.apply_move(x, y)
+            return True
+        return False
+
+    def apply_move(self, x: int, y: int):
+        """Apply one move to the board (the forward delta of the move history)"""
+        # Record previous position for arrow display
+        self.previous_pos = self.knight_pos
+
+        self.knight_pos = (x, y)
+        self.visited[y][x] = True
+        self.move_count += 1
+        self.board[y][x] = self.move_count
+
+        # Snapshot the board periodically so timeline jumps only replay a few moves
+        if self.move_count % self.checkpoint_interval == 0 and self.move_count not in self.checkpoints:
+            self.checkpoints[self.move_count] = [row[:] for row in self.board]
+
+        self.update_game_status()
+
+    def update_game_status(self):
+        """Set game_over and won for the current position"""
+        # Check if won
+        if self.move_count == self.board_size * self.board_size:
+            self.game_over = True
+            self.won = True
+        # Check if no moves left
+        elif not self.get_possible_moves(*self.knight_pos):
+            self.game_over = True
+            self.won = False
+        else:
+            self.game_over = False
+            self.won = False
 
-            self.knight_pos = (x, y)
-            self.visited[y][x] = True
-            self.move_count += 1
-            self.board[y][x] = self.move_count
+    def revert_move(self):
+        """Take back the last move (the backward delta of the move history)"""
+        x, y = self.knight_pos
+        self.visited[y][x] = False
+        self.board[y][x] = 0
+        self.move_count -= 1
 
-            # Check if won
-            if self.move_count == self.board_size * self.board_size:
-                self.game_over = True
-                self.won = True
-            # Check if no moves left
-            elif not self.get_possible_moves(x, y):
-                self.game_over = True
-                self.won = False
+        self.knight_pos = self.move_history[self.move_count - 1]
+        self.previous_pos = self.move_history[self.move_count - 2] if self.move_count > 1 else None
 
-            return True
-        return False
+        # Every earlier position still had a move available
+        self.game_over = False
+        self.won = False
+
+    def can_undo(self) -> bool:
+        """Check if there is a move to undo"""
+        return not self.auto_playing and self.move_count > 1
+
+    def can_redo(self) -> bool:
+        """Check if there is an undone move to redo"""
+        return not self.auto_playing and self.move_count < len(self.move_history)
+
+    def undo(self) -> bool:
+        """Undo the last move"""
+        if not self.can_undo():
+            return False
+        self.revert_move()
+        return True
+
+    def redo(self) -> bool:
+        """Redo the last undone move"""
+        if not self.can_redo():
+            return False
+        self.apply_move(*self.move_history[self.move_count])
+        return True
+
+    def jump_to_move(self, move: int) -> bool:
+        """Jump to any move in the history, replaying from the nearest checkpoint when that is closer"""
+        if self.auto_playing:
+            return False
+        move = max(1, min(move, len(self.move_history)))
+
+        checkpoint = move - move % self.checkpoint_interval
+        if checkpoint in self.checkpoints and move - checkpoint < abs(move - self.move_count):
+            # Only the board is stored; visited squares are the numbered ones
+            board = self.checkpoints[checkpoint]
+            self.board = [row[:] for row in board]
+            self.visited = [[move != 0 for move in row] for row in board]
+            self.move_count = checkpoint
+            self.knight_pos = self.move_history[checkpoint - 1]
+            self.previous_pos = self.move_history[checkpoint - 2] if checkpoint > 1 else None
+
+        while self.move_count > move:
+            self.revert_move()
+        while self.move_count < move:
+            self.apply_move(*self.move_history[self.move_count])
+        # The checkpoint may itself be the target move, so the flags can't be left to apply_move
+        self.update_game_status()
+        return True
 
     def reset_game(self):
         """Reset the game"""
@@ -317,7 +442,11 @@ class KnightTourGame:
 
     def is_button_disabled(self, button_name: str) -> bool:
         """Check if a button should be disabled"""
-        if self.game_over:
+        if button_name == 'undo':
+            return not self.can_undo()
+        elif button_name == 'redo':
+            return not self.can_redo()
+        elif self.game_over:
             # When game is over, only restart and exit are enabled
             return button_name not in ['restart', 'exit']
         elif self.auto_playing:
@@ -359,8 +488,9 @@ class KnightTourGame:
         mid_screen_x = self.board_offset_x + mid_x * self.cell_size + self.cell_size // 2
         mid_screen_y = self.board_offset_y + mid_y * self.cell_size + self.cell_size // 2
 
-        # Create a surface for semi-transparent drawing
-        arrow_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+        # Clear the semi-transparent drawing surface
+        arrow_surface = self.arrow_surface
+        arrow_surface.fill((0, 0, 0, 0))
 
         # Arrow properties
         arrow_width = 15  # Thick arrow body
@@ -453,19 +583,21 @@ class KnightTourGame:
         active_buttons.append('next_step')
         active_buttons.append('restart')
         active_buttons.append('exit')
+        active_buttons.append('undo')
+        active_buttons.append('redo')
 
         # Add either auto_complete or stop_auto, not both
         if self.auto_playing:
-            active_buttons.insert(-2, 'stop_auto')  # Insert before restart
+            active_buttons.insert(1, 'stop_auto')  # Insert before restart
         else:
-            active_buttons.insert(-2, 'auto_complete')  # Insert before restart
+            active_buttons.insert(1, 'auto_complete')  # Insert before restart
 
         # Check clicks only for active buttons
         for button_name in active_buttons:
             if button_name in self.buttons:
                 button_info = self.buttons[button_name]
                 button_rect = button_info['rect'].copy()
-                button_rect.y = button_y
+                button_rect.y = button_y + button_info.get('row', 0) * (self.button_height + self.button_spacing)
 
                 if button_rect.collidepoint(mouse_pos):
                     # Check if button is disabled
@@ -492,6 +624,14 @@ class KnightTourGame:
                     elif button_name == 'stop_auto' and self.auto_playing:
                         self.stop_auto_play()
 
+                    elif button_name == 'undo':
+                        self.undo()
+                        print(f"Undo - Move {self.move_count}")
+
+                    elif button_name == 'redo':
+                        self.redo()
+                        print(f"Redo - Move {self.move_count}")
+
                     elif button_name == 'restart':
                         print("Game reset - Knight placed at a1")
                         self.reset_game()
@@ -528,17 +668,17 @@ class KnightTourGame:
         mouse_pos = pygame.mouse.get_pos()
 
         # Determine which buttons to show
-        buttons_to_show = ['next_step', 'restart', 'exit']
+        buttons_to_show = ['next_step', 'restart', 'exit', 'undo', 'redo']
         if self.auto_playing:
-            buttons_to_show.insert(-2, 'stop_auto')
+            buttons_to_show.insert(1, 'stop_auto')
         else:
-            buttons_to_show.insert(-2, 'auto_complete')
+            buttons_to_show.insert(1, 'auto_complete')
 
         for button_name in buttons_to_show:
             if button_name in self.buttons:
                 button_info = self.buttons[button_name]
                 button_rect = button_info['rect'].copy()
-                button_rect.y = button_y
+                button_rect.y = button_y + button_info.get('row', 0) * (self.button_height + self.button_spacing)
 
                 # Check if button is disabled
                 is_disabled = self.is_button_disabled(button_name)
@@ -640,14 +780,15 @@ class KnightTourGame:
         text_surface = self.font.render(move_text, True, self.BLACK)
         self.screen.blit(text_surface, (self.margin, info_y + 26))
 
-        # Progress bar
-        progress = self.move_count / 64
-        bar_width = self.screen_width - 2 * self.margin
-        bar_height = 26
-        bar_x = self.margin
-        bar_y = info_y + 78
+        # Progress bar, doubling as the timeline slider (lighter part = moves that can be redone)
+        bar_x, bar_y, bar_width, bar_height = self.get_timeline_rect()
+        total_squares = self.board_size * self.board_size
+        progress = self.move_count / total_squares
 
         pygame.draw.rect(self.screen, self.GRAY, (bar_x, bar_y, bar_width, bar_height))
+        if len(self.move_history) > self.move_count:
+            history_width = int(bar_width * len(self.move_history) / total_squares)
+            pygame.draw.rect(self.screen, self.LIGHT_GRAY, (bar_x, bar_y, history_width, bar_height))
         if progress > 0:
             fill_width = int(bar_width * progress)
             color = self.GREEN if self.won else self.BLUE
@@ -673,6 +814,102 @@ class KnightTourGame:
         status_surface = self.font.render(status_text, True, color)
         self.screen.blit(status_surface, (self.margin, info_y + 124))
 
+    def get_timeline_rect(self) -> pygame.Rect:
+        """Get the area of the progress bar / timeline slider"""
+        info_y = self.board_height + self.label_size + self.margin
+        return pygame.Rect(self.margin, info_y + 78, self.screen_width - 2 * self.margin, 26)
+
+    def scrub_timeline(self, mouse_x: int):
+        """Jump to the move under the mouse on the timeline slider"""
+        timeline = self.get_timeline_rect()
+        fraction = (mouse_x - timeline.x) / timeline.width
+        move = math.ceil(fraction * self.board_size * self.board_size)
+        if move != self.move_count:
+            self.jump_to_move(move)
+
+    def render_frame(self):
+        """Draw the board and game information onto the screen surface"""
+        self.screen.fill(self.WHITE)
+        self.draw_coordinate_labels()
+        self.draw_board()
+        self.draw_info()
+
+    def export_images(self, output_dir: str, contact_sheet: bool = False, columns: int = 8,
+                      thumb_scale: float = 0.25, workers: int = 4) -> int:
+        """Render every move played so far to PNG files without opening a window.
+
+        Writes one image per move (move_0001.png, ...) or, with contact_sheet, a single
+        tiled contact_sheet.png. Images leave out the buttons. For per-move images, PNG
+        encoding runs on a thread pool so it overlaps with rendering the next move; the
+        contact sheet scales thumbnails on the calling thread and encodes once at the end.
+        Returns the number of moves rendered.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Recover the move order from the board
+        path = [None] * self.move_count
+        for y in range(self.board_size):
+            for x in range(self.board_size):
+                if self.board[y][x]:
+                    path[self.board[y][x] - 1] = (x, y)
+
+        # Save the current state, then replay the moves onto an empty board
+        saved_state = (self.board, self.visited, self.knight_pos, self.previous_pos,
+                       self.move_count, self.game_over, self.won, self.move_history)
+        self.board = [[0 for _ in range(self.board_size)] for _ in range(self.board_size)]
+        self.visited = [[False for _ in range(self.board_size)] for _ in range(self.board_size)]
+        self.previous_pos = None
+        self.game_over = False
+        self.won = False
+        # Grown one move per frame, so the timeline shows progress rather than redo history
+        self.move_history = []
+
+        frame = self.screen.subsurface((0, 0, self.screen_width, self.export_height))
+        thumb_width = int(self.screen_width * thumb_scale)
+        thumb_height = int(self.export_height * thumb_scale)
+        sheet = None
+        if contact_sheet:
+            rows = (len(path) + columns - 1) // columns
+            sheet = pygame.Surface((thumb_width * columns, thumb_height * rows))
+            sheet.fill(self.WHITE)
+
+        digits = max(4, len(str(len(path))))
+        pending = deque()
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for index, (x, y) in enumerate(path):
+                    self.previous_pos = self.knight_pos if index else None
+                    self.knight_pos = (x, y)
+                    self.move_history.append((x, y))
+                    self.visited[y][x] = True
+                    self.board[y][x] = index + 1
+                    self.move_count = index + 1
+                    if index == len(path) - 1:
+                        self.game_over, self.won = saved_state[5], saved_state[6]
+
+                    self.render_frame()
+
+                    if sheet is not None:
+                        thumb = pygame.transform.smoothscale(frame, (thumb_width, thumb_height))
+                        sheet.blit(thumb, ((index % columns) * thumb_width, (index // columns) * thumb_height))
+                    else:
+                        filename = os.path.join(output_dir, f"move_{index + 1:0{digits}d}.png")
+                        pending.append(executor.submit(pygame.image.save, frame.copy(), filename))
+                        # Limit frames waiting to be encoded so memory stays bounded
+                        if len(pending) > workers * 2:
+                            pending.popleft().result()
+
+                if sheet is not None:
+                    pygame.image.save(sheet, os.path.join(output_dir, "contact_sheet.png"))
+                while pending:
+                    pending.popleft().result()
+        finally:
+            (self.board, self.visited, self.knight_pos, self.previous_pos,
+             self.move_count, self.game_over, self.won, self.move_history) = saved_state
+
+        return len(path)
+
 
     def run(self):
         """Run the main game loop"""
@@ -687,6 +924,7 @@ class KnightTourGame:
         print("   - Green positions show where you can move")
         print("   - Gray cells show visited positions with move numbers")
         print("   - Goal: Complete all 64 squares!")
+        print("   - Undo/Redo (Ctrl+Z / Ctrl+Y) or drag the progress bar to review moves")
         print(f"\nKnight placed at a1")
 
         while running:
@@ -700,6 +938,12 @@ class KnightTourGame:
                         if self.handle_button_click(event.pos):
                             continue
 
+                        # Then the timeline slider (not while auto-playing)
+                        if not self.auto_playing and self.get_timeline_rect().collidepoint(event.pos):
+                            self.dragging_timeline = True
+                            self.scrub_timeline(event.pos[0])
+                            continue
+
                         # Then check board clicks (only if not auto-playing and not game over)
                         if not self.auto_playing and not self.game_over:
                             cell = self.get_cell_from_mouse(event.pos)
@@ -715,11 +959,24 @@ class KnightTourGame:
                                 else:
                                     print("Invalid move! Please click on green highlighted positions")
 
+                elif event.type == pygame.MOUSEBUTTONUP:
+                    if event.button == 1:
+                        self.dragging_timeline = False
+
+                elif event.type == pygame.MOUSEMOTION:
+                    if self.dragging_timeline and not self.auto_playing:
+                        self.scrub_timeline(event.pos[0])
+
+                elif event.type == pygame.KEYDOWN:
+                    # Ctrl+Z / Ctrl+Y for undo / redo
+                    if event.mod & pygame.KMOD_CTRL:
+                        if event.key == pygame.K_z and self.undo():
+                            print(f"Undo - Move {self.move_count}")
+                        elif event.key == pygame.K_y and self.redo():
+                            print(f"Redo - Move {self.move_count}")
+
             # Draw game screen
-            self.screen.fill(self.WHITE)
-            self.draw_coordinate_labels()
-            self.draw_board()
-            self.draw_info()
+            self.render_frame()
             self.draw_buttons()
 
             pygame.display.flip()
@@ -730,8 +987,33 @@ class KnightTourGame:
         sys.exit()
 
 
+def positive_int(value: str) -> int:
+    """Argparse type for integers of at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Knight's Tour Game")
+    parser.add_argument('--export', metavar='DIR',
+                        help="auto-complete a tour and render it to PNG images in DIR without opening a window")
+    parser.add_argument('--contact-sheet', action='store_true',
+                        help="write a single tiled contact sheet instead of one image per move")
+    parser.add_argument('--workers', type=positive_int, default=4, help="threads used for PNG encoding")
+    args = parser.parse_args()
+
     try:
+        if args.export:
+            game = KnightTourGame(8, headless=True)
+            while game.make_auto_move():
+                pass
+            count = game.export_images(args.export, contact_sheet=args.contact_sheet, workers=args.workers)
+            pygame.quit()
+            print(f"Exported {count} moves to {args.export}")
+            sys.exit()
+
         game = KnightTourGame(8)
         game.run()
     except ImportError:
@@ -0,0 +1,156 @@
+import os
+import copy
+import random
+import importlib.util
+
+import pytest
+
+from tour_cli import generate_tours
+
+pygame = pytest.importorskip('pygame')
+
+spec = importlib.util.spec_from_file_location(
+    'knight_tour_game', os.path.join(os.path.dirname(os.path.abspath(__file__)), "Knight's Tour Game.py"))
+knight_tour_game = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(knight_tour_game)
+
+
+def snapshot(game):
+    return (copy.deepcopy(game.board), copy.deepcopy(game.visited), game.knight_pos, game.previous_pos,
+            game.move_count, game.game_over, game.won)
+
+
+# A fixed complete tour from a1, since auto moves can get the knight trapped
+TOUR = next(generate_tours(8, seed=1))
+
+
+def new_game(checkpoint_interval=None):
+    # Auto moves break ties randomly; seed them so tests don't depend on luck
+    random.seed(0)
+    game = knight_tour_game.KnightTourGame(8, headless=True)
+    if checkpoint_interval:
+        game.checkpoint_interval = checkpoint_interval
+    return game
+
+
+def play_tour(game):
+    """Play the fixed complete tour"""
+    for x, y in TOUR[1:]:
+        assert game.move_knight(x, y)
+    assert game.won
+
+
+def play_random_game(game, seed):
+    """Play uniformly random moves until the knight is trapped or the tour is complete"""
+    rng = random.Random(seed)
+    while not game.game_over:
+        game.move_knight(*rng.choice(game.get_possible_moves(*game.knight_pos)))
+
+
+def forward_states(game):
+    """States after each move, replayed from the start with redo"""
+    game.jump_to_move(1)
+    states = {1: snapshot(game)}
+    while game.redo():
+        states[game.move_count] = snapshot(game)
+    return states
+
+
+def test_checkpoints_taken_on_8x8():
+    game = new_game()
+    play_tour(game)
+    assert sorted(game.checkpoints) == list(range(8, 65, 8))
+
+
+def test_undo_redo():
+    game = new_game()
+    for _ in range(5):
+        game.make_auto_move()
+    after_five = snapshot(game)
+    assert game.undo() and game.undo()
+    assert game.move_count == 4
+    assert game.redo() and game.redo()
+    assert snapshot(game) == after_five
+    assert not game.redo()
+
+
+def test_new_move_after_undo_drops_redo_history():
+    game = new_game()
+    for _ in range(10):
+        game.make_auto_move()
+    game.jump_to_move(5)
+    alternatives = [pos for pos in game.get_possible_moves(*game.knight_pos) if pos != game.move_history[5]]
+    if not alternatives:
+        pytest.skip("no alternative move from this position")
+    game.move_knight(*alternatives[0])
+    assert len(game.move_history) == 6
+    assert not game.can_redo()
+    assert all(move <= 6 for move in game.checkpoints)
+
+
+@pytest.mark.parametrize('checkpoint_interval', [1, 4, 8, 256])
+def test_jumps_match_replayed_states(checkpoint_interval):
+    game = new_game(checkpoint_interval)
+    play_tour(game)
+    states = forward_states(game)
+    rng = random.Random(checkpoint_interval)
+    for _ in range(300):
+        move = rng.randint(1, len(states))
+        game.jump_to_move(move)
+        assert snapshot(game) == states[move]
+
+
+def test_jump_to_won_checkpoint():
+    game = new_game(4)
+    play_tour(game)
+    game.jump_to_move(61)
+    game.jump_to_move(64)
+    assert game.game_over and game.won
+
+
+def test_jump_to_trapped_checkpoint():
+    # Find a random game that ends with the knight trapped
+    for seed in range(100):
+        game = new_game()
+        play_random_game(game, seed)
+        if not game.won:
+            break
+    path = list(game.move_history)
+
+    # Replay it so the trapped final position is itself a checkpoint
+    game = new_game(len(path))
+    for x, y in path[1:]:
+        game.move_knight(x, y)
+    assert len(path) in game.checkpoints
+
+    game.jump_to_move(1)
+    game.jump_to_move(len(path))
+    assert game.game_over and not game.won
+
+
+def test_export_images(tmp_path):
+    game = new_game()
+    for _ in range(4):
+        game.make_auto_move()
+    # Leave a move to redo, which exported frames must not show
+    game.undo()
+    before = snapshot(game)
+    history = list(game.move_history)
+
+    frames_dir = str(tmp_path / 'frames')
+    assert game.export_images(frames_dir, workers=2) == 4
+    assert sorted(os.listdir(frames_dir)) == [f"move_{move:04d}.png" for move in range(1, 5)]
+    assert snapshot(game) == before
+    assert game.move_history == history
+
+    image = pygame.image.load(os.path.join(frames_dir, 'move_0001.png'))
+    assert image.get_size() == (game.screen_width, game.export_height)
+    timeline = game.get_timeline_rect()
+    assert tuple(image.get_at((timeline.right - 10, timeline.centery)))[:3] == game.GRAY
+
+    sheet_dir = str(tmp_path / 'sheet')
+    assert game.export_images(sheet_dir, contact_sheet=True, columns=3, thumb_scale=0.25) == 4
+    assert os.listdir(sheet_dir) == ['contact_sheet.png']
+    sheet = pygame.image.load(os.path.join(sheet_dir, 'contact_sheet.png'))
+    assert sheet.get_size() == (int(game.screen_width * 0.25) * 3, int(game.export_height * 0.25) * 2)
+    assert snapshot(game) == before
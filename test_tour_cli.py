@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+from tour_cli import from_notation, generate_tours, main, to_notation
+from tour_store import is_closed_tour, read_tours
+
+
+def is_knight_move(a, b):
+    return {abs(a[0] - b[0]), abs(a[1] - b[1])} == {1, 2}
+
+
+def assert_valid_tour(path, board_size):
+    assert len(path) == board_size * board_size
+    assert len(set(path)) == len(path)
+    assert all(is_knight_move(a, b) for a, b in zip(path, path[1:]))
+
+
+def test_notation_round_trip():
+    assert from_notation('a1', 8) == (0, 7)
+    assert from_notation('h8', 8) == (7, 0)
+    assert all(from_notation(to_notation((x, y), 10), 10) == (x, y) for x in range(10) for y in range(10))
+
+
+@pytest.mark.parametrize('notation', ['', 'a', '1a', 'a1b', 'i1', 'a9', 'a0'])
+def test_from_notation_errors(notation):
+    with pytest.raises(ValueError):
+        from_notation(notation, 8)
+
+
+@pytest.mark.parametrize('strategy', ['warnsdorff', 'backtrack'])
+@pytest.mark.parametrize('board_size', [6, 8])
+def test_closed_tours(strategy, board_size):
+    for path in generate_tours(board_size, (0, board_size - 1), strategy, seed=1, count=3, closed=True):
+        assert_valid_tour(path, board_size)
+        assert is_knight_move(path[-1], path[0])
+
+
+def test_seed_makes_output_reproducible():
+    assert list(generate_tours(8, seed=7, count=3)) == list(generate_tours(8, seed=7, count=3))
+
+
+@pytest.mark.parametrize('board_size, start, closed', [(5, (1, 4), False), (4, (0, 3), False), (5, (0, 4), True)])
+def test_impossible_tours_fail_fast(board_size, start, closed):
+    with pytest.raises(ValueError):
+        list(generate_tours(board_size, start, 'backtrack', closed=closed))
+
+
+def test_binary_output_round_trip(tmp_path):
+    output = str(tmp_path / 'tours.bin')
+    assert main(['--count', '3', '--seed', '1', '--format', 'binary', '-o', output]) == 0
+    with open(output, 'rb') as f:
+        tours = list(read_tours(f))
+    assert tours == [(8, path) for path in generate_tours(8, seed=1, count=3)]
+
+
+def test_jsonl_output(tmp_path):
+    output = str(tmp_path / 'tours.jsonl')
+    assert main(['--size', '6', '--count', '2', '--closed', '--format', 'jsonl', '-o', output]) == 0
+    with open(output) as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 2
+    for record in records:
+        path = [tuple(pos) for pos in record['moves']]
+        assert record['board_size'] == 6
+        assert record['closed'] and is_closed_tour(path, 6)
+        assert path[0] == (0, 5)
+        assert_valid_tour(path, 6)
+
+
+def test_jsonl_allows_large_boards(tmp_path):
+    output = str(tmp_path / 'tours.jsonl')
+    assert main(['--size', '30', '--format', 'jsonl', '-o', output]) == 0
+    with pytest.raises(SystemExit):
+        main(['--size', '30', '--format', 'notation'])
+
+
+@pytest.mark.parametrize('args', [['--count', '-1'], ['--size', '0'], ['--start', ''], ['--start', 'z9']])
+def test_invalid_arguments(args):
+    with pytest.raises(SystemExit):
+        main(args)
+
+
+def test_does_not_import_pygame():
+    # A fresh interpreter, since other tests in the session may have imported pygame
+    result = subprocess.run(
+        [sys.executable, '-c', "import sys, tour_cli; print('pygame' in sys.modules)"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
@@ -0,0 +1,147 @@
+import os
+import random
+
+import pytest
+
+from tour_store import (TourStore, board_to_path, canonical_tour, is_closed_tour, path_to_board,
+                        tour_hash)
+
+
+def symmetric_variants(path, board_size):
+    """All 8 rotations/reflections of a path"""
+    n = board_size - 1
+    transforms = [
+        lambda x, y: (x, y), lambda x, y: (n - x, y), lambda x, y: (x, n - y), lambda x, y: (n - x, n - y),
+        lambda x, y: (y, x), lambda x, y: (n - y, x), lambda x, y: (y, n - x), lambda x, y: (n - y, n - x),
+    ]
+    return [[transform(x, y) for x, y in path] for transform in transforms]
+
+
+KNIGHT_MOVES = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
+
+
+def warnsdorff_paths(count, seed=1, closed=False):
+    """Complete 8x8 tours from a1 using Warnsdorff's heuristic with random tie-breaking"""
+    rng = random.Random(seed)
+
+    def onward(x, y, visited):
+        return [(x + dx, y + dy) for dx, dy in KNIGHT_MOVES
+                if 0 <= x + dx < 8 and 0 <= y + dy < 8 and (x + dx, y + dy) not in visited]
+
+    paths = []
+    while len(paths) < count:
+        path = [(0, 7)]
+        visited = {(0, 7)}
+        while len(path) < 64:
+            moves = onward(*path[-1], visited)
+            if not moves:
+                break
+            fewest = min(len(onward(x, y, visited)) for x, y in moves)
+            path.append(rng.choice([(x, y) for x, y in moves if len(onward(x, y, visited)) == fewest]))
+            visited.add(path[-1])
+        if len(path) == 64 and (not closed or is_closed_tour(path, 8)):
+            paths.append(path)
+    return paths
+
+
+def boards(count, seed=1):
+    return [path_to_board(path, 8) for path in warnsdorff_paths(count, seed)]
+
+
+def test_board_path_round_trip():
+    board = boards(1)[0]
+    assert path_to_board(board_to_path(board), 8) == board
+
+
+def test_symmetric_tours_share_hash():
+    path = board_to_path(boards(1)[0])
+    variants = [path_to_board(variant, 8) for variant in symmetric_variants(path, 8)]
+    assert len({tour_hash(board) for board in variants}) == 1
+    assert len({tuple(canonical_tour(board)) for board in variants}) == 1
+
+
+def test_reversed_closed_tour_shares_hash():
+    path = warnsdorff_paths(1, seed=3, closed=True)[0]
+    assert is_closed_tour(path, 8)
+    reversed_path = [path[0]] + path[:0:-1]
+    assert tour_hash(path_to_board(reversed_path, 8)) == tour_hash(path_to_board(path, 8))
+
+
+def test_different_tours_have_different_hashes():
+    first, second = boards(2)
+    assert tour_hash(first) != tour_hash(second)
+
+
+def test_duplicates_and_symmetric_variants_are_rejected(tmp_path):
+    board = boards(1)[0]
+    rotated = path_to_board(symmetric_variants(board_to_path(board), 8)[5], 8)
+    with TourStore(str(tmp_path)) as store:
+        assert store.add(board)
+        assert not store.add(board)
+        assert not store.add(rotated)
+        assert rotated in store
+        assert len(store) == 1
+
+
+def test_reopen_keeps_tours(tmp_path):
+    tours = boards(50)
+    unique = len({tour_hash(board) for board in tours})
+    with TourStore(str(tmp_path), shards=4, buffer_limit=16) as store:
+        assert sum(store.add(board) for board in tours) == unique
+
+    with TourStore(str(tmp_path), shards=4) as store:
+        assert len(store) == unique
+        assert all(board in store for board in tours)
+        assert not any(store.add(board) for board in tours)
+        assert len(list(store.iter_tours())) == unique
+
+
+def test_reopen_with_other_shard_count_fails(tmp_path):
+    with TourStore(str(tmp_path), shards=4) as store:
+        store.add(boards(1)[0])
+    with pytest.raises(ValueError):
+        TourStore(str(tmp_path), shards=8)
+
+
+def test_compaction_limits_runs(tmp_path):
+    tours = boards(200)
+    unique = len({tour_hash(board) for board in tours})
+    with TourStore(str(tmp_path), shards=2, buffer_limit=5, max_runs=3) as store:
+        for board in tours:
+            store.add(board)
+        assert all(len(runs) <= 3 for runs in store.runs.values())
+        assert len(store) == unique
+        assert all(board in store for board in tours)
+
+    runs = os.listdir(os.path.join(str(tmp_path), 'index'))
+    assert len(runs) <= 2 * 3
+
+
+def test_recovers_tours_of_unclosed_store(tmp_path):
+    tours = boards(25)
+    unique = len({tour_hash(board) for board in tours})
+    store = TourStore(str(tmp_path), shards=4, buffer_limit=10)
+    for board in tours:
+        store.add(board)
+    # Simulate a killed process: tours since the last flush are on disk, their hashes are not
+    store.tours_file.flush()
+    assert store.buffered
+
+    with TourStore(str(tmp_path), shards=4) as store:
+        assert len(store) == unique
+        assert not any(store.add(board) for board in tours)
+        assert len(list(store.iter_tours())) == unique
+
+
+def test_drops_partly_written_tour(tmp_path):
+    tours = boards(5)
+    with TourStore(str(tmp_path)) as store:
+        for board in tours:
+            store.add(board)
+        count = len(store)
+    with open(os.path.join(str(tmp_path), 'tours.bin'), 'ab') as f:
+        f.write(b'\x00\x08\x00\x40\x01')
+
+    with TourStore(str(tmp_path)) as store:
+        assert len(store) == count
+        assert len(list(store.iter_tours())) == count
@@ -0,0 +1,244 @@
+"""Command-line knight's tour generator.
+
+Streams tours to stdout or a file without importing pygame, e.g.:
+
+    python tour_cli.py --size 8 --start a1 --count 1000 --format jsonl
+
+JSON lines records list the moves as [x, y] board coordinates (y = 0 is the
+top row, as in KnightTourGame), so they work on boards of any size.
+"""
+import os
+import sys
+import json
+import random
+import argparse
+from typing import Iterator, List, Optional, Tuple
+
+from tour_store import encode_tour, is_closed_tour
+
+# Knight's 8 possible move directions
+KNIGHT_MOVES = [
+    (-2, -1), (-2, 1), (-1, -2), (-1, 2),
+    (1, -2), (1, 2), (2, -1), (2, 1)
+]
+
+STRATEGIES = ['warnsdorff', 'backtrack']
+FORMATS = ['notation', 'jsonl', 'binary']
+
+
+def knight_neighbours(board_size: int) -> List[List[int]]:
+    """Get the squares a knight can reach from each square, as square indices (y * board_size + x)"""
+    neighbours = []
+    for y in range(board_size):
+        for x in range(board_size):
+            neighbours.append([(y + dy) * board_size + (x + dx) for dx, dy in KNIGHT_MOVES
+                               if 0 <= x + dx < board_size and 0 <= y + dy < board_size])
+    return neighbours
+
+
+def warnsdorff_tour(neighbours: List[List[int]], start: int, rng: random.Random,
+                    closed: bool = False) -> Optional[List[int]]:
+    """Walk one tour with Warnsdorff's heuristic and random tie-breaking, or None if the knight gets trapped"""
+    total = len(neighbours)
+    visited = [False] * total
+    degree = [len(squares) for squares in neighbours]
+    # For closed tours, one square next to the start must stay free until the last move
+    start_neighbours = set(neighbours[start]) if closed else set()
+    start_free = len(start_neighbours)
+
+    path = [start]
+    visited[start] = True
+    current = start
+    while len(path) < total:
+        best_moves = []
+        min_onward_moves = total
+        for square in neighbours[current]:
+            if visited[square]:
+                continue
+            degree[square] -= 1
+            if square in start_neighbours and start_free == 1 and len(path) < total - 1:
+                continue
+            if degree[square] < min_onward_moves:
+                min_onward_moves = degree[square]
+                best_moves = [square]
+            elif degree[square] == min_onward_moves:
+                best_moves.append(square)
+        if not best_moves:
+            return None
+        current = rng.choice(best_moves)
+        visited[current] = True
+        path.append(current)
+        if current in start_neighbours:
+            start_free -= 1
+    return path
+
+
+def backtrack_tour(neighbours: List[List[int]], start: int, rng: random.Random,
+                   closed: bool, max_steps: Optional[int] = None) -> Optional[List[int]]:
+    """Depth-first search for a tour, trying moves in Warnsdorff order.
+
+    Returns an empty list if the search proved no tour exists, or None if none was found
+    within max_steps moves (no limit if None), since an early wrong choice can leave the
+    search stuck in a huge dead subtree.
+    """
+    total = len(neighbours)
+    visited = [False] * total
+    # For closed tours, stop extending a path once every square next to the start is used
+    start_neighbours = set(neighbours[start]) if closed else set()
+    start_free = len(start_neighbours)
+
+    def ordered_moves(square: int) -> List[int]:
+        # Fewest onward moves last, so pop() tries it first
+        moves = [s for s in neighbours[square] if not visited[s]]
+        keys = {s: (sum(1 for t in neighbours[s] if not visited[t]), rng.random()) for s in moves}
+        return sorted(moves, key=keys.get, reverse=True)
+
+    path = [start]
+    visited[start] = True
+    stack = [ordered_moves(start)]
+    steps = 0
+    while path and (max_steps is None or steps < max_steps):
+        if len(path) == total and (not closed or start in neighbours[path[-1]]):
+            return path
+        if stack[-1]:
+            square = stack[-1].pop()
+            steps += 1
+            visited[square] = True
+            path.append(square)
+            if square in start_neighbours:
+                start_free -= 1
+            if closed and start_free == 0 and len(path) < total:
+                stack.append([])
+            else:
+                stack.append(ordered_moves(square))
+        else:
+            stack.pop()
+            square = path.pop()
+            visited[square] = False
+            if square in start_neighbours:
+                start_free += 1
+    return [] if not path else None
+
+
+def generate_tours(board_size: int = 8, start: Tuple[int, int] = (0, 7), strategy: str = 'warnsdorff',
+                   seed: Optional[int] = None, count: int = 1, closed: bool = False,
+                   max_attempts: int = 1000) -> Iterator[List[Tuple[int, int]]]:
+    """Lazily generate tours as lists of (x, y) squares; count 0 generates forever"""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    if closed and board_size % 2 == 1:
+        raise ValueError("Closed tours do not exist on boards with an odd number of squares")
+    # A knight alternates colours, so on odd boards a tour starts and ends on the corners' colour
+    if board_size % 2 == 1 and sum(start) % 2 == 1:
+        raise ValueError(f"No tour starts from {to_notation(start, board_size)} on a {board_size}x{board_size} "
+                         f"board, tours on odd boards start on the colour of the corners")
+
+    rng = random.Random(seed)
+    neighbours = knight_neighbours(board_size)
+    start_square = start[1] * board_size + start[0]
+
+    generated = 0
+    while count == 0 or generated < count:
+        squares = None
+        for _ in range(max_attempts):
+            if strategy == 'warnsdorff':
+                squares = warnsdorff_tour(neighbours, start_square, rng, closed)
+                if squares and (not closed or start_square in neighbours[squares[-1]]):
+                    break
+                squares = None
+            elif len(neighbours) <= 36:
+                # Boards up to 6x6 are searched exhaustively in well under a second
+                squares = backtrack_tour(neighbours, start_square, rng, closed)
+                break
+            else:
+                # Restart with a fresh random move order when the search stalls
+                squares = backtrack_tour(neighbours, start_square, rng, closed, 20 * len(neighbours))
+                if squares is not None:
+                    break
+
+        if not squares:
+            raise ValueError(f"No tour found from {to_notation(start, board_size)} on a {board_size}x{board_size} board")
+
+        yield [(square % board_size, square // board_size) for square in squares]
+        generated += 1
+
+
+def to_notation(pos: Tuple[int, int], board_size: int) -> str:
+    """Convert board coordinates to chess notation (rank 1 is the bottom row)"""
+    x, y = pos
+    return f"{chr(ord('a') + x)}{board_size - y}"
+
+
+def from_notation(notation: str, board_size: int) -> Tuple[int, int]:
+    """Convert chess notation to board coordinates"""
+    if len(notation) < 2 or not notation[0].isalpha() or not notation[1:].isdigit():
+        raise ValueError(f"Invalid square: {notation!r}")
+    x = ord(notation[0].lower()) - ord('a')
+    y = board_size - int(notation[1:])
+    if not (0 <= x < board_size and 0 <= y < board_size):
+        raise ValueError(f"Square {notation} is not on a {board_size}x{board_size} board")
+    return x, y
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate knight's tours and stream them to stdout or a file")
+    parser.add_argument('--size', type=int, default=8, help="board size (default: 8)")
+    parser.add_argument('--start', default='a1', help="start square in chess notation (default: a1)")
+    parser.add_argument('--strategy', choices=STRATEGIES, default='warnsdorff',
+                        help="warnsdorff retries random walks, backtrack searches exhaustively")
+    parser.add_argument('--seed', type=int, help="random seed for reproducible output")
+    parser.add_argument('--count', type=int, default=1, help="number of tours, 0 for an endless stream")
+    parser.add_argument('--closed', action='store_true', help="only generate closed tours")
+    parser.add_argument('--format', choices=FORMATS, default='notation', help="output format")
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    # Notation has one letter per file; the binary format stores the path length as uint16
+    if args.size < 1:
+        parser.error("board size must be at least 1")
+    if args.count < 0:
+        parser.error("count must be at least 0")
+    if args.format == 'notation' and args.size > 26:
+        parser.error("notation output needs a board size of at most 26, use --format jsonl or binary")
+    if args.format == 'binary' and args.size > 255:
+        parser.error("binary output needs a board size of at most 255")
+    try:
+        start = from_notation(args.start, args.size)
+    except ValueError as e:
+        parser.error(str(e))
+
+    binary = args.format == 'binary'
+    if args.output:
+        out = open(args.output, 'wb' if binary else 'w')
+    else:
+        out = sys.stdout.buffer if binary else sys.stdout
+
+    try:
+        for path in generate_tours(args.size, start, args.strategy, args.seed, args.count, args.closed):
+            if binary:
+                out.write(encode_tour(path, args.size))
+            elif args.format == 'jsonl':
+                out.write(json.dumps({
+                    'board_size': args.size,
+                    'closed': is_closed_tour(path, args.size),
+                    'moves': [list(pos) for pos in path]
+                }) + '\n')
+            else:
+                out.write(' '.join(to_notation(pos, args.size) for pos in path) + '\n')
+        out.flush()
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Downstream command (e.g. head) stopped reading; silence the flush at exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    finally:
+        if args.output:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+import os
+import json
+import heapq
+import struct
+import hashlib
+from typing import BinaryIO, Dict, Iterator, List, Sequence, Set, Tuple
+
+# Size of a tour hash in bytes (blake2b digest)
+DIGEST_SIZE = 16
+
+# Binary tour header: board size and number of squares in the path
+_HEADER = struct.Struct('>HH')
+
+
+def board_to_path(board: List[List[int]]) -> List[Tuple[int, int]]:
+    """Convert a move-number grid (board[y][x] = move number, 0 = unvisited) to a list of (x, y) squares"""
+    path = {}
+    for y, row in enumerate(board):
+        for x, move in enumerate(row):
+            if move:
+                path[move] = (x, y)
+    return [path[move] for move in range(1, len(path) + 1)]
+
+
+def path_to_board(path: Sequence[Tuple[int, int]], board_size: int) -> List[List[int]]:
+    """Convert a list of (x, y) squares back to a move-number grid"""
+    board = [[0 for _ in range(board_size)] for _ in range(board_size)]
+    for move, (x, y) in enumerate(path, start=1):
+        board[y][x] = move
+    return board
+
+
+def is_closed_tour(path: Sequence[Tuple[int, int]], board_size: int) -> bool:
+    """Check if the path is a complete tour whose last square is a knight's move away from the first"""
+    if len(path) != board_size * board_size or len(path) < 2:
+        return False
+    (x1, y1), (x2, y2) = path[0], path[-1]
+    return {abs(x1 - x2), abs(y1 - y2)} == {1, 2}
+
+
+def _symmetries(board_size: int):
+    """The 8 dihedral symmetries of the square board as functions on (x, y)"""
+    n = board_size - 1
+    return [
+        lambda x, y: (x, y),
+        lambda x, y: (n - x, y),
+        lambda x, y: (x, n - y),
+        lambda x, y: (n - x, n - y),
+        lambda x, y: (y, x),
+        lambda x, y: (n - y, x),
+        lambda x, y: (y, n - x),
+        lambda x, y: (n - y, n - x),
+    ]
+
+
+def canonical_squares(path: Sequence[Tuple[int, int]], board_size: int) -> List[int]:
+    """Get the canonical form of a path as square indices (y * board_size + x).
+
+    The canonical form is the lexicographically smallest index sequence among the
+    8 rotations/reflections of the path and, for closed tours, their reversals
+    (same start square, walked the other way round).
+    """
+    candidates = [path]
+    if is_closed_tour(path, board_size):
+        candidates.append([path[0]] + list(reversed(path[1:])))
+
+    best = None
+    for transform in _symmetries(board_size):
+        for candidate in candidates:
+            squares = []
+            for x, y in candidate:
+                tx, ty = transform(x, y)
+                squares.append(ty * board_size + tx)
+            if best is None or squares < best:
+                best = squares
+    return best if best is not None else []
+
+
+def canonical_tour(board: List[List[int]]) -> List[Tuple[int, int]]:
+    """Get the canonical form of the tour in a move-number grid as a list of (x, y) squares"""
+    board_size = len(board)
+    squares = canonical_squares(board_to_path(board), board_size)
+    return [(square % board_size, square // board_size) for square in squares]
+
+
+def encode_squares(squares: Sequence[int], board_size: int) -> bytes:
+    """Encode square indices in the compact binary tour format.
+
+    Layout: big-endian uint16 board size, uint16 path length, then one byte per
+    square (two bytes, big-endian, on boards with more than 256 squares).
+    """
+    header = _HEADER.pack(board_size, len(squares))
+    if board_size * board_size <= 256:
+        return header + bytes(squares)
+    return header + struct.pack(f'>{len(squares)}H', *squares)
+
+
+def encode_tour(path: Sequence[Tuple[int, int]], board_size: int) -> bytes:
+    """Encode a list of (x, y) squares in the compact binary tour format"""
+    return encode_squares([y * board_size + x for x, y in path], board_size)
+
+
+def read_tours(stream: BinaryIO) -> Iterator[Tuple[int, List[Tuple[int, int]]]]:
+    """Read (board_size, path) pairs from a stream of binary-encoded tours"""
+    while True:
+        header = stream.read(_HEADER.size)
+        if not header:
+            return
+        if len(header) < _HEADER.size:
+            raise ValueError("Truncated tour header")
+        board_size, length = _HEADER.unpack(header)
+        width = 1 if board_size * board_size <= 256 else 2
+        data = stream.read(length * width)
+        if len(data) < length * width:
+            raise ValueError("Truncated tour data")
+        squares = data if width == 1 else struct.unpack(f'>{length}H', data)
+        yield board_size, [(square % board_size, square // board_size) for square in squares]
+
+
+def canonical_encoding(board: List[List[int]]) -> Tuple[bytes, bytes]:
+    """Get the binary encoding of the canonical form of a move-number grid and its hash"""
+    board_size = len(board)
+    encoded = encode_squares(canonical_squares(board_to_path(board), board_size), board_size)
+    return encoded, hashlib.blake2b(encoded, digest_size=DIGEST_SIZE).digest()
+
+
+def tour_hash(board: List[List[int]]) -> bytes:
+    """Compute a compact hash of the tour in a move-number grid, identical for all its symmetric variants"""
+    return canonical_encoding(board)[1]
+
+
+class TourStore:
+    """Deduplicating on-disk store of tours, keyed by their canonical hash.
+
+    New hashes are buffered in memory and flushed as sorted runs, one set of
+    runs per shard, so RAM stays bounded by ``buffer_limit`` regardless of how
+    many tours are stored. Membership checks binary-search the runs of a single
+    shard, opening each run only while it is searched, and a shard's runs are
+    merged once there are more than ``max_runs``. Canonical tours are appended
+    to ``tours.bin`` in the compact binary format. ``store.json`` records the
+    shard count, since hashes can only be found again with the same sharding,
+    and how much of ``tours.bin`` the runs cover: tours written after the last
+    flush are re-hashed on open, so a killed process doesn't break dedup.
+    """
+
+    def __init__(self, directory: str, shards: int = 256, buffer_limit: int = 100000, max_runs: int = 8):
+        self.directory = directory
+        self.shards = shards
+        self.buffer_limit = buffer_limit
+        self.max_runs = max_runs
+
+        self.index_dir = os.path.join(directory, 'index')
+        os.makedirs(self.index_dir, exist_ok=True)
+        self._check_metadata()
+
+        # Shard -> hashes not yet written to a run
+        self.buffer: Dict[int, Set[bytes]] = {}
+        self.buffered = 0
+
+        # Shard -> list of (run path, number of hashes), oldest first
+        self.runs: Dict[int, List[Tuple[str, int]]] = {}
+        self.run_counter = 0
+        self.count = 0
+        self._load_runs()
+
+        self.tours_path = os.path.join(directory, 'tours.bin')
+        self._recover_tours()
+        self.tours_file = open(self.tours_path, 'ab')
+
+    def _check_metadata(self):
+        """Save the shard count of a new store, or check it matches the one of an existing store"""
+        self.metadata_path = os.path.join(self.directory, 'store.json')
+        if os.path.exists(self.metadata_path):
+            with open(self.metadata_path) as f:
+                self.metadata = json.load(f)
+            if self.metadata['shards'] != self.shards:
+                raise ValueError(f"Store in {self.directory} uses {self.metadata['shards']} shards, not {self.shards}")
+        else:
+            self.metadata = {'shards': self.shards, 'indexed_bytes': 0}
+            self._save_metadata()
+
+    def _save_metadata(self):
+        """Atomically replace store.json"""
+        tmp_path = self.metadata_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.metadata, f)
+        os.replace(tmp_path, self.metadata_path)
+
+    def _load_runs(self):
+        """Register the runs left by a previous session"""
+        for name in sorted(os.listdir(self.index_dir)):
+            if name.endswith('.tmp'):
+                # Run a previous session was killed while writing
+                os.remove(os.path.join(self.index_dir, name))
+                continue
+            if not name.endswith('.run'):
+                continue
+            shard, run = name[:-4].split('-')
+            self.run_counter = max(self.run_counter, int(run) + 1)
+            self._add_run(int(shard), os.path.join(self.index_dir, name))
+
+    def _recover_tours(self):
+        """Re-hash tours written after the last flush of a session that didn't close the store"""
+        if not os.path.exists(self.tours_path):
+            return
+        indexed_bytes = self.metadata.get('indexed_bytes', 0)
+        if os.path.getsize(self.tours_path) == indexed_bytes:
+            return
+
+        with open(self.tours_path, 'rb') as f:
+            f.seek(indexed_bytes)
+            end = indexed_bytes
+            try:
+                for board_size, path in read_tours(f):
+                    encoded = encode_tour(path, board_size)
+                    digest = hashlib.blake2b(encoded, digest_size=DIGEST_SIZE).digest()
+                    # Hashes of tours flushed just before the metadata update are already indexed
+                    if not self.contains_hash(digest):
+                        self.buffer.setdefault(self._shard_of(digest), set()).add(digest)
+                        self.buffered += 1
+                        self.count += 1
+                    end = f.tell()
+            except ValueError:
+                # The last tour was only partly written
+                pass
+
+        if end != os.path.getsize(self.tours_path):
+            with open(self.tours_path, 'r+b') as f:
+                f.truncate(end)
+
+    def _add_run(self, shard: int, path: str):
+        """Register a run file for its shard"""
+        records = os.path.getsize(path) // DIGEST_SIZE
+        self.runs.setdefault(shard, []).append((path, records))
+        self.count += records
+
+    def _new_run_path(self, shard: int) -> str:
+        path = os.path.join(self.index_dir, f"{shard:05d}-{self.run_counter:08d}.run")
+        self.run_counter += 1
+        return path
+
+    def _shard_of(self, digest: bytes) -> int:
+        return int.from_bytes(digest[:4], 'big') % self.shards
+
+    @staticmethod
+    def _run_contains(f: BinaryIO, records: int, digest: bytes) -> bool:
+        """Binary search a sorted run of fixed-size hashes"""
+        low, high = 0, records
+        while low < high:
+            mid = (low + high) // 2
+            f.seek(mid * DIGEST_SIZE)
+            record = f.read(DIGEST_SIZE)
+            if record < digest:
+                low = mid + 1
+            elif record > digest:
+                high = mid
+            else:
+                return True
+        return False
+
+    def contains_hash(self, digest: bytes) -> bool:
+        """Check if a tour hash is already in the store"""
+        shard = self._shard_of(digest)
+        if digest in self.buffer.get(shard, ()):
+            return True
+        # Open runs only while searching them, so the number of runs never
+        # runs into the open file limit
+        for path, records in self.runs.get(shard, ()):
+            with open(path, 'rb') as f:
+                if self._run_contains(f, records, digest):
+                    return True
+        return False
+
+    def __contains__(self, board: List[List[int]]) -> bool:
+        return self.contains_hash(tour_hash(board))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, board: List[List[int]]) -> bool:
+        """Add the tour in a move-number grid, returning False if it (or a symmetric variant) is already stored"""
+        encoded, digest = canonical_encoding(board)
+        if self.contains_hash(digest):
+            return False
+
+        self.buffer.setdefault(self._shard_of(digest), set()).add(digest)
+        self.buffered += 1
+        self.count += 1
+        self.tours_file.write(encoded)
+
+        if self.buffered >= self.buffer_limit:
+            self.flush()
+        return True
+
+    def flush(self):
+        """Write buffered hashes as one sorted run per shard"""
+        # Tours go to disk before their hashes, so the index never refers to a missing tour
+        self.tours_file.flush()
+        os.fsync(self.tours_file.fileno())
+
+        for shard, digests in self.buffer.items():
+            path = self._new_run_path(shard)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(b''.join(sorted(digests)))
+            os.replace(path + '.tmp', path)
+            # The run is registered below, so don't count its hashes twice
+            self.count -= len(digests)
+            self._add_run(shard, path)
+            if len(self.runs[shard]) > self.max_runs:
+                self._compact(shard)
+        self.buffer = {}
+        self.buffered = 0
+
+        self.metadata['indexed_bytes'] = self.tours_file.tell()
+        self._save_metadata()
+
+    @staticmethod
+    def _iter_run(path: str) -> Iterator[bytes]:
+        with open(path, 'rb') as f:
+            while True:
+                record = f.read(DIGEST_SIZE)
+                if not record:
+                    return
+                yield record
+
+    def _compact(self, shard: int):
+        """Merge all runs of a shard into one, streaming so memory use stays constant"""
+        old_runs = self.runs.pop(shard)
+        path = self._new_run_path(shard)
+        with open(path + '.tmp', 'wb') as f:
+            f.writelines(heapq.merge(*(self._iter_run(run_path) for run_path, _ in old_runs)))
+        os.replace(path + '.tmp', path)
+        for run_path, records in old_runs:
+            self.count -= records
+            os.remove(run_path)
+        self._add_run(shard, path)
+
+    def iter_tours(self) -> Iterator[Tuple[int, List[Tuple[int, int]]]]:
+        """Iterate over the stored canonical tours as (board_size, path) pairs"""
+        self.tours_file.flush()
+        with open(self.tours_path, 'rb') as f:
+            yield from read_tours(f)
+
+    def close(self):
+        """Flush buffered hashes and close the tours file"""
+        self.flush()
+        self.tours_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()